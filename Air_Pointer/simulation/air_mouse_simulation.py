@@ -8,6 +8,7 @@ Uses tkinter (built-in) for graphics.
 import sys
 import re
 import math
+import array
 import tkinter as tk
 from tkinter import ttk, messagebox
 from collections import deque
@@ -35,6 +36,18 @@ WINDOW_HEIGHT = 800
 SENSITIVITY_X = 10.0  # Roll affects X axis
 SENSITIVITY_Y = 10.0  # Pitch affects Y axis
 
+# Arrow pointer size and outline (pointing right, rotated at draw time)
+ARROW_SIZE = 35
+ARROW_POINTS = (
+    (ARROW_SIZE, 0),                  # Tip
+    (-ARROW_SIZE/2, -ARROW_SIZE/2),   # Top back
+    (-ARROW_SIZE/4, 0),               # Notch
+    (-ARROW_SIZE/2, ARROW_SIZE/2),    # Bottom back
+)
+
+# Fraction of the oldest trail segments left undrawn (near background color)
+TRAIL_CULL_FRACTION = 0.25
+
 # Smoothing - number of samples to average
 SMOOTHING_SAMPLES = 5
 
@@ -53,10 +66,20 @@ PANEL_COLOR = "#19192d"
 # ═══════════════════════════════════════════════════════════════════════════════
 # SERIAL PORT UTILITIES
 # ═══════════════════════════════════════════════════════════════════════════════
+PORT_CACHE_TTL = 2.0  # seconds a port scan stays valid
+_port_cache = (float('-inf'), [])  # (scan time, ports)
+
+
 def list_serial_ports():
-    """List all available serial ports."""
+    """List all available serial ports (cached for PORT_CACHE_TTL seconds)."""
+    global _port_cache
+    now = time.monotonic()
+    if now - _port_cache[0] < PORT_CACHE_TTL:
+        return _port_cache[1]
     ports = serial.tools.list_ports.comports()
-    return [(p.device, p.description) for p in ports]
+    result = [(p.device, p.description) for p in ports]
+    _port_cache = (now, result)
+    return result
 
 
 def find_esp32_port():
@@ -69,13 +92,16 @@ def find_esp32_port():
     return None
 
 
+_SENSOR_PATTERN = re.compile(rb'Pitch:\s*([-\d.]+).*Roll:\s*([-\d.]+)')
+
+
 def parse_sensor_data(line):
     """
-    Parse the serial output from ESP32.
-    Expected format: "Pitch: 12.34  | Roll: 56.78    (Accel Z: 0.99)"
+    Parse the serial output from ESP32 (raw bytes, no decoding needed).
+    Expected format: b"Pitch: 12.34  | Roll: 56.78    (Accel Z: 0.99)"
     """
     try:
-        match = re.search(r'Pitch:\s*([-\d.]+).*Roll:\s*([-\d.]+)', line)
+        match = _SENSOR_PATTERN.search(line)
         if match:
             pitch = float(match.group(1))
             roll = float(match.group(2))
@@ -106,15 +132,28 @@ class AirMouseSimulation:
         self.target_x = self.pointer_x
         self.target_y = self.pointer_y
         self.pointer_angle = -45  # degrees
+        self._arrow_angle = None  # angle the cached (cos, sin) belongs to
+        self._arrow_cs = (1.0, 0.0)
         
         # Sensor data
         self.last_pitch = 0.0
         self.last_roll = 0.0
-        self.pitch_buffer = deque(maxlen=SMOOTHING_SAMPLES)
-        self.roll_buffer = deque(maxlen=SMOOTHING_SAMPLES)
+        
+        # Values currently drawn by the labels (pitch/roll as label text)
+        self._shown_pitch = None
+        self._shown_roll = None
+        self._shown_pos = (self.pointer_x, self.pointer_y)
+        # Smoothing ring buffers with running sums (O(1) average per frame)
+        self._pitch_ring = array.array('d', [0.0] * SMOOTHING_SAMPLES)
+        self._roll_ring = array.array('d', [0.0] * SMOOTHING_SAMPLES)
+        self._pitch_sum = 0.0
+        self._roll_sum = 0.0
+        self._ring_idx = 0
+        self._ring_count = 0
         
         # Trail
         self.trail = deque(maxlen=30)
+        self._trail_shown = 0  # trail items currently visible
         
         # Demo mode
         self.demo_mode = tk.BooleanVar(value=False)
@@ -189,6 +228,13 @@ class AirMouseSimulation:
                 fill="", outline=POINTER_COLOR, width=2-i*0.5)
             self.glow_items.append(glow)
         
+        # Trail segments, created once and moved/recolored every frame
+        for _ in range(self.trail.maxlen - 1):
+            line = self.canvas.create_line(0, 0, 0, 0, fill=POINTER_COLOR,
+                capstyle=tk.ROUND, state=tk.HIDDEN)
+            self.trail_items.append(line)
+            self.canvas.tag_lower(line)
+        
         # Main arrow polygon
         self.arrow = self.canvas.create_polygon(
             0, 0, 0, 0, 0, 0, 0, 0,
@@ -299,20 +345,33 @@ class AirMouseSimulation:
     
     def _read_serial_loop(self):
         """Background thread to read serial data."""
+        tail = b''  # partial line carried over to the next read
         while self.running and self.connected:
             try:
                 if self.serial_port and self.serial_port.in_waiting:
-                    line = self.serial_port.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
+                    # Drain everything buffered in one read, then split lines
+                    tail += self.serial_port.read(self.serial_port.in_waiting)
+                    *lines, tail = tail.split(b'\n')
+                    for line in lines:
                         pitch, roll = parse_sensor_data(line)
                         if pitch is not None:
-                            self.pitch_buffer.append(pitch)
-                            self.roll_buffer.append(roll)
+                            self._push_sample(pitch, roll)
             except:
                 self.connected = False
                 break
             time.sleep(0.01)
     
+    def _push_sample(self, pitch, roll):
+        """Add a sample to the smoothing rings, updating the running sums."""
+        idx = self._ring_idx
+        self._pitch_sum += pitch - self._pitch_ring[idx]
+        self._roll_sum += roll - self._roll_ring[idx]
+        self._pitch_ring[idx] = pitch
+        self._roll_ring[idx] = roll
+        self._ring_idx = (idx + 1) % SMOOTHING_SAMPLES
+        if self._ring_count < SMOOTHING_SAMPLES:
+            self._ring_count += 1
+    
     def _show_port_dialog(self):
         """Show port selection dialog."""
         ports = list_serial_ports()
@@ -363,8 +422,8 @@ class AirMouseSimulation:
         self.target_y = self.pointer_y
         self.trail.clear()
         for item in self.trail_items:
-            self.canvas.delete(item)
-        self.trail_items.clear()
+            self.canvas.itemconfig(item, state=tk.HIDDEN)
+        self._trail_shown = 0
     
     def _update(self):
         """Main update loop."""
@@ -374,10 +433,10 @@ class AirMouseSimulation:
         # Get sensor data
         dx, dy = 0, 0
         
-        if self.connected and self.pitch_buffer:
+        if self.connected and self._ring_count:
             # Calculate smoothed values
-            self.last_pitch = sum(self.pitch_buffer) / len(self.pitch_buffer)
-            self.last_roll = sum(self.roll_buffer) / len(self.roll_buffer)
+            self.last_pitch = self._pitch_sum / self._ring_count
+            self.last_roll = self._roll_sum / self._ring_count
             
             # Convert to movement
             dx = self.last_roll * SENSITIVITY_X * 0.1
@@ -409,6 +468,17 @@ class AirMouseSimulation:
         if abs(dx) > 0.5 or abs(dy) > 0.5:
             self.pointer_angle = math.degrees(math.atan2(dy, dx)) - 45
         
+        # Idle: pointer has reached its target and the trail has collapsed
+        # onto it, so the canvas already shows this frame
+        if (dx == 0 and dy == 0
+                and abs(self.pointer_x - self.target_x) < 0.1
+                and abs(self.pointer_y - self.target_y) < 0.1
+                and self.trail
+                and abs(self.trail[0][0] - self.pointer_x) < 0.1
+                and abs(self.trail[0][1] - self.pointer_y) < 0.1):
+            self.root.after(16, self._update)
+            return
+        
         # Add to trail
         self.trail.append((self.pointer_x, self.pointer_y))
         
@@ -423,23 +493,20 @@ class AirMouseSimulation:
     def _update_pointer(self):
         """Update pointer position and rotation."""
         x, y = self.pointer_x, self.pointer_y
-        size = 35
-        
-        # Arrow points (pointing right, then rotated)
-        points = [
-            (size, 0),           # Tip
-            (-size/2, -size/2),  # Top back
-            (-size/4, 0),        # Notch
-            (-size/2, size/2),   # Bottom back
-        ]
+        size = ARROW_SIZE
+        
+        # Rotation only changes when the pointer turns
+        if self.pointer_angle != self._arrow_angle:
+            angle = math.radians(self.pointer_angle)
+            self._arrow_cs = (math.cos(angle), math.sin(angle))
+            self._arrow_angle = self.pointer_angle
+        c, s = self._arrow_cs
         
         # Rotate points
-        angle = math.radians(self.pointer_angle)
         rotated = []
-        for px, py in points:
-            rx = px * math.cos(angle) - py * math.sin(angle)
-            ry = px * math.sin(angle) + py * math.cos(angle)
-            rotated.extend([x + rx, y + ry])
+        for px, py in ARROW_POINTS:
+            rotated.append(x + px * c - py * s)
+            rotated.append(y + px * s + py * c)
         
         # Update arrow
         self.canvas.coords(self.arrow, *rotated)
@@ -451,34 +518,43 @@ class AirMouseSimulation:
     
     def _update_trail(self):
         """Update the motion trail."""
-        # Remove old trail items
-        for item in self.trail_items:
-            self.canvas.delete(item)
-        self.trail_items.clear()
-        
-        # Draw new trail
-        if len(self.trail) > 1:
-            points = list(self.trail)
-            for i in range(1, len(points)):
-                alpha = int(255 * (i / len(points)) * 0.5)
-                # Convert alpha to hex color with transparency simulation
-                color = f"#{alpha:02x}{int(200*i/len(points)):02x}{int(255*i/len(points)):02x}"
-                width = 1 + (i / len(points)) * 4
-                
-                line = self.canvas.create_line(
-                    points[i-1][0], points[i-1][1],
-                    points[i][0], points[i][1],
-                    fill=color, width=width, capstyle=tk.ROUND
-                )
-                self.trail_items.append(line)
-                self.canvas.tag_lower(line)
+        points = list(self.trail)
+        n = len(points)
+        # The oldest segments are drawn almost in the background color; skip them
+        start = int(n * TRAIL_CULL_FRACTION) + 1
+        shown = 0
+        for i in range(start, n):
+            alpha = int(255 * (i / n) * 0.5)
+            # Convert alpha to hex color with transparency simulation
+            color = f"#{alpha:02x}{int(200*i/n):02x}{int(255*i/n):02x}"
+            width = 1 + (i / n) * 4
+            
+            line = self.trail_items[shown]
+            self.canvas.coords(line,
+                points[i-1][0], points[i-1][1],
+                points[i][0], points[i][1])
+            self.canvas.itemconfig(line, fill=color, width=width, state=tk.NORMAL)
+            shown += 1
+        
+        # Hide segments shown last frame but not this one
+        for line in self.trail_items[shown:self._trail_shown]:
+            self.canvas.itemconfig(line, state=tk.HIDDEN)
+        self._trail_shown = shown
     
     def _update_labels(self):
-        """Update sensor value labels."""
-        self.canvas.itemconfig(self.pitch_label, text=f"Pitch: {self.last_pitch:>7.2f}°")
-        self.canvas.itemconfig(self.roll_label, text=f"Roll:  {self.last_roll:>7.2f}°")
-        self.canvas.itemconfig(self.pos_label, 
-            text=f"Pointer: ({int(self.pointer_x)}, {int(self.pointer_y)})")
+        """Update sensor value labels (only those whose shown value changed)."""
+        pitch = f"Pitch: {self.last_pitch:>7.2f}°"
+        if pitch != self._shown_pitch:
+            self._shown_pitch = pitch
+            self.canvas.itemconfig(self.pitch_label, text=pitch)
+        roll = f"Roll:  {self.last_roll:>7.2f}°"
+        if roll != self._shown_roll:
+            self._shown_roll = roll
+            self.canvas.itemconfig(self.roll_label, text=roll)
+        pos = (int(self.pointer_x), int(self.pointer_y))
+        if pos != self._shown_pos:
+            self._shown_pos = pos
+            self.canvas.itemconfig(self.pos_label, text=f"Pointer: ({pos[0]}, {pos[1]})")
     
     def _on_close(self):
         """Handle window close."""
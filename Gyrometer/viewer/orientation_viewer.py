@@ -4,56 +4,151 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 import serial
 import threading
+import ctypes
+import struct
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # optional, quat_to_mat4 runs as plain Python
+
 # Modern Tech Palette
 COLOR_PCB = (0.05, 0.2, 0.1)
 COLOR_HUD = (0, 1.0, 0.8)  # Cyan
 COLOR_ACCENT = (1.0, 0.2, 0.4) # Pink/Red
 
+# Binary frame: FRAME_SYNC, then FRAME_LEN bytes (1-byte tag + 4 float32)
+FRAME_SYNC = 0xAA
+FRAME_TAG_QUAT = ord('Q')
+FRAME_LEN = 17
+
+def quat_to_mat4(w, x, y, z, out):
+    """Write the rotation matrix of quaternion (w, x, y, z) into out[0:16]."""
+    xx, yy, zz = x*x, y*y, z*z
+    xy, xz, yz = x*y, x*z, y*z
+    wx, wy, wz = w*x, w*y, w*z
+    out[0] = 1 - 2*(yy + zz); out[1] = 2*(xy - wz);     out[2] = 2*(xz + wy);      out[3] = 0.0
+    out[4] = 2*(xy + wz);     out[5] = 1 - 2*(xx + zz); out[6] = 2*(yz - wx);      out[7] = 0.0
+    out[8] = 2*(xz - wy);     out[9] = 2*(yz + wx);     out[10] = 1 - 2*(xx + yy); out[11] = 0.0
+    out[12] = 0.0;            out[13] = 0.0;            out[14] = 0.0;             out[15] = 1.0
+
+# Compile to native code when numba is installed
+if njit is not None:
+    quat_to_mat4 = njit(cache=True, fastmath=True)(quat_to_mat4)
+
 class AdvancedViewer:
     def __init__(self, port):
-        self.quat = [1.0, 0.0, 0.0, 0.0]
+        # Double-buffered quaternion (w, x, y, z): the serial thread writes the
+        # back buffer, then flips the index so render() never sees a torn read
+        self._quat_buf = [np.array([1, 0, 0, 0], dtype=np.float32),
+                          np.array([1, 0, 0, 0], dtype=np.float32)]
+        self._quat_idx = 0
+        self._dirty = True  # a new quat arrived since the last render
         self.running = True
         
+        # Rotation matrix, reused every frame and passed to GL as-is
+        self._mat = np.empty(16, dtype=np.float32)
+        
         # Initialize Pygame with Multi-sampling (Anti-aliasing)
         pygame.init()
         pygame.display.gl_set_attribute(GL_MULTISAMPLEBUFFERS, 1)
         pygame.display.gl_set_attribute(GL_MULTISAMPLESAMPLES, 4)
         self.display = (1000, 700)
-        pygame.display.set_mode(self.display, DOUBLEBUF | OPENGL)
+        try:
+            pygame.display.set_mode(self.display, DOUBLEBUF | OPENGL)
+        except pygame.error:
+            # No multisample visual available, retry without it
+            pygame.display.gl_set_attribute(GL_MULTISAMPLEBUFFERS, 0)
+            pygame.display.gl_set_attribute(GL_MULTISAMPLESAMPLES, 0)
+            pygame.display.set_mode(self.display, DOUBLEBUF | OPENGL)
         pygame.display.set_caption("ESP32-S3 9-Axis Pro-Viewer")
         
+        # Without hardware sample buffers MSAA would run on a slow fallback path
+        if not glGetIntegerv(GL_SAMPLE_BUFFERS):
+            print("Warning: no multisample buffers, anti-aliasing disabled")
+            glDisable(GL_MULTISAMPLE)
+        
         # OpenGL setup (must be after display mode is set)
         glEnable(GL_DEPTH_TEST)
         glMatrixMode(GL_PROJECTION)
         gluPerspective(45, self.display[0]/self.display[1], 0.1, 50.0)
         glMatrixMode(GL_MODELVIEW)
         
+        # Upload static board geometry once (interleaved x,y,z,r,g,b)
+        board = []
+        # Main Board
+        for v in [(-2,-0.1,-1.5), (2,-0.1,-1.5), (2,0.1,-1.5), (-2,0.1,-1.5)]: board.append(v + COLOR_PCB) # Back
+        # Chip with "Silk Screen"
+        for v in [(-0.3,0.11,-0.3), (0.3,0.11,-0.3), (0.3,0.11,0.3), (-0.3,0.11,0.3)]: board.append(v + (0.1, 0.1, 0.1))
+        board = np.array(board, dtype=np.float32)
+        self.board_count = len(board)
+        self.board_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.board_vbo)
+        glBufferData(GL_ARRAY_BUFFER, board.nbytes, board, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
         # Start Serial
         self.ser = serial.Serial(port, 921600, timeout=0.01)
         threading.Thread(target=self.update_data, daemon=True).start()
 
     def update_data(self):
+        # Receive buffer, reused for every read. Accepts binary QUAT frames
+        # (sync byte, tag, 4 x little-endian float32) and falls back to the
+        # ASCII "QUAT,w,x,y,z" lines.
+        buf = bytearray(1024)
+        mv = memoryview(buf)
+        fill = 0
         while self.running:
-            line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-            if line.startswith('QUAT'):
-                try:
-                    p = line.split(',')
-                    self.quat = [float(p[1]), float(p[2]), float(p[3]), float(p[4])]
-                except: pass
+            n = min(self.ser.in_waiting or 1, len(buf) - fill)
+            fill += self.ser.readinto(mv[fill:fill + n])
+            i = 0
+            while i < fill:
+                if buf[i] == FRAME_SYNC:
+                    if fill - i < 1 + FRAME_LEN:
+                        break
+                    if buf[i + 1] == FRAME_TAG_QUAT:
+                        self.store_quat(*struct.unpack_from('<4f', buf, i + 2))
+                    i += 1 + FRAME_LEN
+                    continue
+                j = buf.find(b'\n', i, fill)
+                if j < 0:
+                    break
+                if buf.startswith(b'QUAT', i, j):
+                    try:
+                        p = buf[i:j].split(b',')
+                        self.store_quat(float(p[1]), float(p[2]), float(p[3]), float(p[4]))
+                    except: pass
+                i = j + 1
+            if i == 0 and fill == len(buf):
+                i = fill  # No complete message in a full buffer, drop it
+            # Keep the partial message at the start of the buffer
+            buf[:fill - i] = buf[i:fill]
+            fill -= i
+
+    def store_quat(self, w, x, y, z):
+        # Duplicate quats (device at rest) leave the last frame on screen
+        fw, fx, fy, fz = self._quat_buf[self._quat_idx].tolist()
+        if (abs(w - fw) <= 1e-4 and abs(x - fx) <= 1e-4
+                and abs(y - fy) <= 1e-4 and abs(z - fz) <= 1e-4):
+            return
+        back = self._quat_buf[self._quat_idx ^ 1]
+        back[0], back[1], back[2], back[3] = w, x, y, z
+        self._quat_idx ^= 1
+        self._dirty = True
 
     def draw_styled_board(self):
-        # Draw a detailed PCB
-        glBegin(GL_QUADS)
-        # Main Board
-        glColor3f(*COLOR_PCB)
-        for v in [(-2,-0.1,-1.5), (2,-0.1,-1.5), (2,0.1,-1.5), (-2,0.1,-1.5)]: glVertex3f(*v) # Back
-        # Chip with "Silk Screen"
-        glColor3f(0.1, 0.1, 0.1)
-        glVertex3f(-0.3, 0.11, -0.3); glVertex3f(0.3, 0.11, -0.3)
-        glVertex3f(0.3, 0.11, 0.3); glVertex3f(-0.3, 0.11, 0.3)
-        glEnd()
+        # Draw a detailed PCB from the static VBO
+        stride = 6 * 4  # 6 float32 per vertex
+        glBindBuffer(GL_ARRAY_BUFFER, self.board_vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(0))
+        glColorPointer(3, GL_FLOAT, stride, ctypes.c_void_p(3 * 4))
+        glDrawArrays(GL_QUADS, 0, self.board_count)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     def render(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -64,13 +159,10 @@ class AdvancedViewer:
         
         # Fusion Rotation
         glPushMatrix()
-        w, x, y, z = self.quat
+        w, x, y, z = self._quat_buf[self._quat_idx].tolist()
         # Convert Quat to Matrix
-        m = [1-2*y*y-2*z*z, 2*x*y-2*z*w, 2*x*z+2*y*w, 0,
-             2*x*y+2*z*w, 1-2*x*x-2*z*z, 2*y*z-2*x*w, 0,
-             2*x*z-2*y*w, 2*y*z+2*x*w, 1-2*x*x-2*y*y, 0,
-             0, 0, 0, 1]
-        glMultMatrixf(m)
+        quat_to_mat4(w, x, y, z, self._mat)
+        glMultMatrixf(self._mat)
         self.draw_styled_board()
         glPopMatrix()
         
@@ -83,6 +175,11 @@ if __name__ == "__main__":
         for event in pygame.event.get():
             if event.type == QUIT:
                 v.running = False
-        v.render()
+            elif event.type == VIDEOEXPOSE:
+                v._dirty = True
+        # Only redraw when the orientation changed
+        if v._dirty:
+            v._dirty = False
+            v.render()
         clock.tick(60)
     pygame.quit()
\ No newline at end of file
@@ -7,6 +7,8 @@ import time
 import argparse
 import sys
 import glob
+import queue
+from math import isnan, isinf
 
 app = Flask(__name__)
 app.config['TEMPLATES_AUTO_RELOAD'] = True
@@ -20,6 +22,15 @@ euler_count = 0
 status_count = 0
 last_log_time = 0
 
+# EULER samples waiting for the next batched emit
+pending_euler = []
+pending_lock = threading.Lock()
+EULER_BATCH_INTERVAL = 0.05  # seconds
+
+# Emits handed off by the reader threads, sent by emit_worker
+emit_q = queue.SimpleQueue()
+EMIT_QUEUE_LIMIT = 256  # drop the oldest beyond this instead of blocking
+
 def serial_scanner():
     """Scans for available serial ports."""
     if sys.platform.startswith('win'):
@@ -37,77 +48,117 @@ def serial_scanner():
 
     usual_ports = { '/dev/cu.usbmodem101', '/dev/tty.usbmodem101', '/dev/cu.usbserial-A5069RR4', '/dev/tty.usbserial-A5069RR4' }
 
-    ports = usual_ports.intersection(ports)
+    # Only known device paths are kept, so no need to open each one to probe
+    return sorted(usual_ports.intersection(ports))
 
-    result = []
-    for port in ports:
+def handle_euler(parts, line):
+    """Handle the fields of an EULER line (str or bytes, float() accepts both)."""
+    global current_euler, euler_count, last_log_time
+    if len(parts) == 4:
         try:
-            s = serial.Serial(port)
-            s.close()
-            result.append(port)
-        except (OSError, serial.SerialException):
-            pass
-    return result
+            roll = float(parts[1])
+            pitch = float(parts[2])
+            yaw = float(parts[3])
+            # Reject nan/inf values
+            if isnan(roll) or isnan(pitch) or isnan(yaw) or isinf(roll) or isinf(pitch) or isinf(yaw):
+                return
+            current_euler = [roll, pitch, yaw]
+            with pending_lock:
+                pending_euler.append((roll, pitch, yaw))
+            euler_count += 1
+            # Log stats every 5 seconds
+            now = time.time()
+            if now - last_log_time >= 5:
+                print(f"[INFO] EULER received: {euler_count} total | STATUS: {status_count} | roll={roll:.2f} pitch={pitch:.2f} yaw={yaw:.2f}")
+                last_log_time = now
+        except ValueError as e:
+            print(f"[ERROR] Bad EULER parse: {repr(line)} -> {e}")
+    else:
+        print(f"[ERROR] EULER wrong field count ({len(parts)}): {repr(line[:80])}")
+
+def handle_status(parts, line):
+    """Handle the fields of a STATUS line."""
+    global status_count
+    if len(parts) == 3:
+        try:
+            imu_ok = int(parts[1]) == 1
+            mag_ok = int(parts[2]) == 1
+            queue_emit('device_status', {'imu': imu_ok, 'mag': mag_ok})
+            status_count += 1
+        except ValueError:
+            print(f"[ERROR] Bad STATUS parse: {repr(line)}")
+
+def handle_transport(parts, line):
+    """Handle the fields of a TRANSPORT line."""
+    if len(parts) == 2:
+        mode = parts[1].strip()
+        print(f"Transport mode: {mode}")
+        queue_emit('transport_mode', {'mode': mode})
+
+# Line handlers keyed by the tag before the first comma
+HANDLERS = {
+    'EULER': handle_euler,
+    'STATUS': handle_status,
+    'TRANSPORT': handle_transport,
+}
+
+# Known device chatter that is not worth a warning
+IGNORED_PREFIXES = ('=', 'WiFi', 'MPU', 'HMC', 'ERROR', 'DIAG')
 
 def process_line(line):
     """Process a data line from either serial or UDP."""
-    global current_euler, euler_count, status_count, last_log_time
     line = line.strip()
     if not line:
         return
 
-    # Log unrecognized lines for debugging
-    if not (line.startswith('EULER') or line.startswith('STATUS') or line.startswith('TRANSPORT')):
-        if not line.startswith('=') and not line.startswith('WiFi') and not line.startswith('MPU') and not line.startswith('HMC') and not line.startswith('ERROR') and not line.startswith('DIAG'):
-            print(f"[WARN] Unknown line: {repr(line[:80])}")
-        return
+    parts = line.split(',')
+    handler = HANDLERS.get(parts[0])
+    if handler:
+        handler(parts, line)
+    elif not line.startswith(IGNORED_PREFIXES):
+        # Log unrecognized lines for debugging
+        print(f"[WARN] Unknown line: {repr(line[:80])}")
 
-    if line.startswith('EULER'):
-        parts = line.split(',')
-        if len(parts) == 4:
-            try:
-                roll = float(parts[1])
-                pitch = float(parts[2])
-                yaw = float(parts[3])
-                # Reject nan/inf values
-                import math
-                if any(math.isnan(v) or math.isinf(v) for v in (roll, pitch, yaw)):
-                    return
-                current_euler = [roll, pitch, yaw]
-                socketio.emit('euler_data', {'roll': roll, 'pitch': pitch, 'yaw': yaw})
-                euler_count += 1
-                # Log stats every 5 seconds
-                now = time.time()
-                if now - last_log_time >= 5:
-                    print(f"[INFO] EULER received: {euler_count} total | STATUS: {status_count} | roll={roll:.2f} pitch={pitch:.2f} yaw={yaw:.2f}")
-                    last_log_time = now
-            except ValueError as e:
-                print(f"[ERROR] Bad EULER parse: {repr(line)} -> {e}")
-        else:
-            print(f"[ERROR] EULER wrong field count ({len(parts)}): {repr(line[:80])}")
-
-    elif line.startswith('STATUS'):
-        parts = line.split(',')
-        if len(parts) == 3:
-            try:
-                imu_ok = int(parts[1]) == 1
-                mag_ok = int(parts[2]) == 1
-                socketio.emit('device_status', {'imu': imu_ok, 'mag': mag_ok})
-                status_count += 1
-            except ValueError:
-                print(f"[ERROR] Bad STATUS parse: {repr(line)}")
-
-    elif line.startswith('TRANSPORT'):
-        parts = line.split(',')
-        if len(parts) == 2:
-            mode = parts[1].strip()
-            print(f"Transport mode: {mode}")
-            socketio.emit('transport_mode', {'mode': mode})
+def process_line_bytes(data):
+    """Process a raw data line; EULER lines are parsed without decoding."""
+    if data.startswith(b'EULER'):
+        handle_euler(data.split(b','), data)
+    else:
+        process_line(data.decode('utf-8', errors='ignore'))
+
+def queue_emit(event, payload):
+    """Queue an emit for emit_worker so the caller never blocks on the socket."""
+    if emit_q.qsize() >= EMIT_QUEUE_LIMIT:
+        try:
+            emit_q.get_nowait()
+        except queue.Empty:
+            pass
+    emit_q.put((event, payload))
+
+def emit_worker():
+    """Send queued emits from a dedicated thread."""
+    while running:
+        try:
+            event, payload = emit_q.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        socketio.emit(event, payload)
+
+def euler_batcher():
+    """Emit the EULER samples collected since the last tick as one batch."""
+    global pending_euler
+    while running:
+        socketio.sleep(EULER_BATCH_INTERVAL)
+        with pending_lock:
+            batch, pending_euler = pending_euler, []
+        if batch:
+            socketio.emit('euler_batch', {'samples': batch})
 
 def serial_reader(port_name, baud_rate):
     """Read data from serial port with auto-reconnect."""
     global running
     ser = None
+    tail = b''  # partial line carried over to the next read
 
     while running:
         # Connect / reconnect
@@ -117,6 +168,7 @@ def serial_reader(port_name, baud_rate):
                 print(f"Serial: Connected to {port_name} at {baud_rate} baud")
                 # Flush any garbage in the buffer after connecting
                 ser.reset_input_buffer()
+                tail = b''
             except serial.SerialException as e:
                 print(f"Serial: Waiting for {port_name}... ({e})")
                 time.sleep(2)
@@ -124,9 +176,11 @@ def serial_reader(port_name, baud_rate):
 
         # Read loop
         try:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
-            if line:
-                process_line(line)
+            # Drain everything buffered in one read, then split lines
+            tail += ser.read(max(1, ser.in_waiting))
+            *lines, tail = tail.split(b'\n')
+            for line in lines:
+                process_line_bytes(line)
         except Exception:
             print(f"Serial: Lost connection to {port_name}, reconnecting...")
             try:
@@ -151,12 +205,15 @@ def udp_listener(udp_port):
     sock.settimeout(1.0)
     print(f"UDP: Listening on port {udp_port}")
 
+    # Receive into one preallocated buffer; each packet is then copied once
+    # into an immutable bytes for parsing (no per-packet str decode)
+    buf = bytearray(2048)
+    mv = memoryview(buf)
     while running:
         try:
-            data, addr = sock.recvfrom(1024)
-            line = data.decode('utf-8', errors='ignore').strip()
-            if line:
-                process_line(line)
+            n, addr = sock.recvfrom_into(buf)
+            if n:
+                process_line_bytes(bytes(mv[:n]))
         except socket.timeout:
             continue
         except Exception as e:
@@ -182,6 +239,10 @@ if __name__ == '__main__':
 
     web_port = args.web_port
 
+    # ── Start emit worker and batched EULER emitter ──
+    socketio.start_background_task(emit_worker)
+    socketio.start_background_task(euler_batcher)
+
     # ── Start UDP listener (always) ──
     udp_thread = threading.Thread(target=udp_listener, args=(args.udp_port,), daemon=True)
     udp_thread.start()